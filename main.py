@@ -8,18 +8,13 @@
 import asyncio
 import logging
 import sys
-from pathlib import Path
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 from src.config import AppConfig, setup_logging
-from src.infrastructure.mqtt_client import MQTTClientManager
-from src.infrastructure.parsers import MessageParserFactory
-from src.application.transformers import MessageTransformer
-from src.application.repositories import TargetServerRepository
-from src.application.services import MessageProcessingService
 
-# Добавляем src в путь для импортов
-sys.path.insert(0, str(Path(__file__).parent))
+if TYPE_CHECKING:
+    from src.infrastructure.mqtt_client import MQTTClientManager
+    from src.application.services import MessageProcessingService
 
 logger = logging.getLogger(__name__)
 
@@ -35,14 +30,23 @@ class TransportServiceApp:
             config: Конфигурация приложения
         """
         self.config = config
-        self.mqtt_client: Optional[MQTTClientManager] = None
-        self.processing_service: Optional[MessageProcessingService] = None
+        self.mqtt_client: Optional["MQTTClientManager"] = None
+        self.processing_service: Optional["MessageProcessingService"] = None
 
     async def _setup_services(self) -> None:
         """Настраивает сервисы приложения."""
+        # Импортируем здесь, чтобы aiohttp, aiomqtt и protobuf загружались
+        # только при запуске сервиса, а не при импорте модуля
+        from src.infrastructure.mqtt_client import MQTTClientManager
+        from src.infrastructure.parsers import MessageParserFactory
+        from src.application.transformers import MessageTransformer
+        from src.application.repositories import TargetServerRepository
+        from src.application.services import MessageProcessingService
+
         # Создаем парсер сообщений
         parser = MessageParserFactory.create_parser(
-            self.config.mqtt.payload_format
+            self.config.mqtt.payload_format,
+            include_raw_payload=self.config.mqtt.include_raw_payload,
         )
 
         # Создаем трансформатор
@@ -64,17 +68,6 @@ class TransportServiceApp:
         # Создаем MQTT клиент
         self.mqtt_client = MQTTClientManager(self.config.mqtt)
 
-    async def _message_handler(self, topic: str, payload: bytes) -> None:
-        """
-        Обработчик сообщений от MQTT брокера.
-
-        Args:
-            topic: MQTT топик
-            payload: Данные сообщения
-        """
-        if self.processing_service:
-            await self.processing_service.process_message(topic, payload)
-
     async def run(self) -> None:
         """Запускает приложение."""
         try:
@@ -86,11 +79,12 @@ class TransportServiceApp:
             # Подключаемся к MQTT брокеру
             await self.mqtt_client.connect()
 
-            # Подписываемся на топик
+            # Подписываемся на топик, сообщения обрабатываются
+            # пулом воркеров MQTT клиента
             logger.info(f"Подписка на топик: {self.config.mqtt.topic}")
             await self.mqtt_client.subscribe(
                 self.config.mqtt.topic,
-                self._message_handler,
+                self.processing_service.process_message,
             )
 
         except KeyboardInterrupt:
@@ -150,6 +144,30 @@ async def main() -> None:
         sys.exit(1)
 
 
+def _install_event_loop_policy() -> None:
+    """
+    Устанавливает более быстрый event loop, если он доступен.
+
+    Предпочитает uringcore (io_uring, Linux >= 5.11), затем uvloop.
+    Без этих пакетов используется стандартный asyncio.
+    """
+    try:
+        import uringcore
+
+        asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+        return
+    except ImportError:
+        pass
+
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+
 if __name__ == "__main__":
+    _install_event_loop_policy()
     asyncio.run(main())
 
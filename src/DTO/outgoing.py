@@ -7,7 +7,15 @@ DTO для исходящих сообщений на целевые серве
 import uuid
 from datetime import datetime
 from typing import Dict, Any, Optional
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+_now = datetime.utcnow
+_uuid4 = uuid.uuid4
+
+
+def _new_idempotency_key() -> str:
+    """Генерирует ключ идемпотентности (UUID без дефисов)."""
+    return _uuid4().hex
 
 
 class OutgoingMessageDTO(BaseModel):
@@ -23,11 +31,13 @@ class OutgoingMessageDTO(BaseModel):
     6. время отправки (sent_at)
     """
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     impedance_key: str = Field(
         description="Ключ импедантности для идентификации источника"
     )
     idempotency_key: str = Field(
-        default_factory=lambda: str(uuid.uuid4()),
+        default_factory=_new_idempotency_key,
         description="Уникальный ключ идемпотентности для каждого запроса"
     )
     request_type: str = Field(
@@ -41,7 +51,7 @@ class OutgoingMessageDTO(BaseModel):
         description="Метаинформация о сообщении"
     )
     sent_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=_now,
         description="Время отправки сообщения"
     )
 
@@ -50,17 +60,21 @@ class OutgoingMessageDTO(BaseModel):
     def validate_idempotency_key(cls, v: str) -> str:
         """Валидация ключа идемпотентности."""
         if not v or not v.strip():
-            return str(uuid.uuid4())
+            return _new_idempotency_key()
         return v
 
     def to_dict(self) -> Dict[str, Any]:
-        """Преобразует DTO в словарь для сериализации."""
+        """
+        Преобразует DTO в словарь для сериализации.
+
+        sent_at остается datetime и сериализуется в ISO формат HTTP клиентом.
+        """
         return {
             "impedance_key": self.impedance_key,
             "idempotency_key": self.idempotency_key,
             "request_type": self.request_type,
             "request_body": self.request_body,
             "meta": self.meta,
-            "sent_at": self.sent_at.isoformat(),
+            "sent_at": self.sent_at,
         }
 
@@ -4,9 +4,13 @@
 Управляет конфигурацией и доступом к целевым серверам.
 """
 
-from typing import List
+from typing import Callable, Dict, List, Tuple
 from src.config import TargetServerConfig
-from src.domain.interfaces import ITargetServerRepository
+from src.domain.interfaces import (
+    ITargetServerClient,
+    ITargetServerRepository,
+    RoutingTable,
+)
 
 
 class TargetServerRepository(ITargetServerRepository):
@@ -16,18 +20,34 @@ class TargetServerRepository(ITargetServerRepository):
         """
         Создает репозиторий.
 
+        Индекс серверов по типам сообщений строится один раз при создании,
+        поэтому выборка на каждое сообщение сводится к одному обращению к словарю.
+
         Args:
             servers: Список конфигураций целевых серверов
         """
         self._servers = servers
+        self._enabled: Tuple[TargetServerConfig, ...] = tuple(
+            s for s in servers if s.enable
+        )
+
+        by_type: Dict[str, List[TargetServerConfig]] = {}
+        for server in self._enabled:
+            for message_type in server.allowed_types:
+                by_type.setdefault(message_type, []).append(server)
+
+        self._by_type: Dict[str, Tuple[TargetServerConfig, ...]] = {
+            message_type: tuple(type_servers)
+            for message_type, type_servers in by_type.items()
+        }
 
-    def get_enabled_servers(self) -> List[TargetServerConfig]:
-        """Возвращает список включенных серверов."""
-        return [s for s in self._servers if s.enable]
+    def get_enabled_servers(self) -> Tuple[TargetServerConfig, ...]:
+        """Возвращает включенные серверы."""
+        return self._enabled
 
     def get_servers_for_message_type(
         self, message_type: str
-    ) -> List[TargetServerConfig]:
+    ) -> Tuple[TargetServerConfig, ...]:
         """
         Возвращает серверы, которые принимают указанный тип сообщений.
 
@@ -35,14 +55,38 @@ class TargetServerRepository(ITargetServerRepository):
             message_type: Тип сообщения
 
         Returns:
-            Список конфигураций серверов
+            Кортеж конфигураций серверов
+        """
+        return self._by_type.get(message_type.lower(), ())
+
+    def build_routes(
+        self,
+        client_factory: Callable[[TargetServerConfig], ITargetServerClient],
+    ) -> RoutingTable:
         """
-        message_type_lower = message_type.lower()
-        enabled_servers = self.get_enabled_servers()
+        Строит таблицу маршрутизации по типам сообщений.
 
-        return [
-            s
-            for s in enabled_servers
-            if message_type_lower in s.allowed_types
-        ]
+        Для каждого типа сообщений содержит кортеж маршрутов
+        (название сервера, клиент, ключ импедантности или None,
+        признак пакетной отправки).
+        Клиенты не создаются: client_factory возвращает уже созданный
+        клиент сервера.
 
+        Args:
+            client_factory: Функция, возвращающая существующий клиент сервера
+
+        Returns:
+            Таблица маршрутизации
+        """
+        return {
+            message_type: tuple(
+                (
+                    s.name,
+                    client_factory(s),
+                    s.impedance_key or None,
+                    s.batch_enabled,
+                )
+                for s in servers
+            )
+            for message_type, servers in self._by_type.items()
+        }
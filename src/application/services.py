@@ -6,12 +6,25 @@
 
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Sequence, cast
 
 from src.domain.models import MeshtasticMessage
-from src.domain.interfaces import IMessageParser, IMessageTransformer
+from src.domain.interfaces import (
+    IBatchingTargetServerClient,
+    IMessageParser,
+    IMessageTransformer,
+    ITargetServerClient,
+    PayloadBuffer,
+    Route,
+)
 from src.config import TargetServerConfig
-from src.infrastructure.http_client import TargetServerHTTPClient
+from src.infrastructure.http_client import (
+    BatchingHTTPClient,
+    HttpClientPool,
+    TargetServerHTTPClient,
+)
+from src.infrastructure.log_throttle import TracebackThrottle
 from src.application.repositories import TargetServerRepository
 from src.application.transformers import MessageTransformer
 
@@ -41,13 +54,28 @@ class MessageProcessingService:
         self.transformer = transformer
         self.repository = repository
         self.default_impedance_key = default_impedance_key
-        self._clients: Dict[str, TargetServerHTTPClient] = {}
-
-    def _get_or_create_client(
-        self, config: TargetServerConfig
-    ) -> TargetServerHTTPClient:
+        self._http_pool = HttpClientPool()
+        self._tracebacks = TracebackThrottle(logger)
+
+        # Клиенты создаются один раз для всех включенных серверов
+        self._clients: Mapping[str, ITargetServerClient] = MappingProxyType({
+            config.name: self._create_client(config)
+            for config in repository.get_enabled_servers()
+        })
+
+        # Таблица маршрутизации строится один раз: на каждое сообщение
+        # остается один поиск по типу и обход готовых маршрутов
+        self._routes = repository.build_routes(
+            lambda config: self._clients[config.name]
+        )
+
+    def _create_client(self, config: TargetServerConfig) -> ITargetServerClient:
         """
-        Получает или создает HTTP клиент для сервера.
+        Создает HTTP клиент для сервера.
+
+        Все клиенты используют общую HTTP сессию из пула.
+        Для серверов с batch_enabled клиент оборачивается в BatchingHTTPClient,
+        маршруты таких серверов помечаются признаком пакетной отправки.
 
         Args:
             config: Конфигурация сервера
@@ -55,11 +83,14 @@ class MessageProcessingService:
         Returns:
             HTTP клиент
         """
-        if config.name not in self._clients:
-            self._clients[config.name] = TargetServerHTTPClient(config)
-        return self._clients[config.name]
+        http_client = TargetServerHTTPClient(config, self._http_pool)
+        if config.batch_enabled:
+            return BatchingHTTPClient(http_client)
+        return http_client
 
-    async def process_message(self, topic: str, payload: bytes) -> None:
+    async def process_message(
+        self, topic: str, payload: PayloadBuffer
+    ) -> None:
         """
         Обрабатывает сообщение от MQTT брокера.
 
@@ -71,8 +102,10 @@ class MessageProcessingService:
             # Парсим сообщение
             message = self.parser.parse(topic, payload)
             logger.debug(
-                f"Получено сообщение: type={message.message_type}, "
-                f"from={message.from_node}, topic={topic}"
+                "Получено сообщение: type=%s, from=%s, topic=%s",
+                message.message_type_str,
+                message.from_node,
+                topic,
             )
 
             # Проверяем, нужно ли обрабатывать это сообщение
@@ -80,14 +113,13 @@ class MessageProcessingService:
                 logger.debug("Пропущено сообщение без типа")
                 return
 
-            # Получаем серверы для этого типа сообщений
-            servers = self.repository.get_servers_for_message_type(
-                message.message_type
-            )
+            # Получаем маршруты для этого типа сообщений
+            routes = self._routes.get(message.message_type_str)
 
-            if not servers:
+            if not routes:
                 logger.debug(
-                    f"Нет серверов для типа сообщения: {message.message_type}"
+                    "Нет серверов для типа сообщения: %s",
+                    message.message_type_str,
                 )
                 return
 
@@ -101,82 +133,80 @@ class MessageProcessingService:
                 return
 
             # Отправляем на все подходящие серверы
-            await self._send_to_servers(servers, transformed_data)
+            await self._send_to_servers(routes, transformed_data)
 
         except Exception as e:
-            logger.error(
-                f"Ошибка обработки сообщения из топика {topic}: {e}",
-                exc_info=True
+            self._tracebacks.warning(
+                "process_message",
+                e,
+                "Ошибка обработки сообщения из топика %s: %s",
+                topic,
+                e,
             )
 
     async def _send_to_servers(
         self,
-        servers: List[TargetServerConfig],
+        routes: Sequence[Route],
         data: Dict[str, Any],
     ) -> None:
         """
-        Отправляет данные на список серверов.
+        Отправляет данные по маршрутам параллельно.
+
+        Ошибки каждого сервера обрабатываются в _send_to_server,
+        поэтому отказ одного сервера не отменяет отправку на остальные.
+        Данные копируются только для серверов со своим ключом
+        импедантности, остальные используют общий словарь.
 
         Args:
-            servers: Список конфигураций серверов
+            routes: Маршруты (название сервера, клиент, ключ импедантности,
+                признак пакетной отправки)
             data: Данные для отправки
         """
-        tasks = []
-        for server_config in servers:
-            # Создаем копию данных для каждого сервера
-            # чтобы можно было использовать разные ключи импедантности
-            server_data = data.copy()
-            
-            # Используем ключ импедантности из конфигурации сервера, если есть
-            if server_config.impedance_key:
-                server_data["impedance_key"] = server_config.impedance_key
-
-            client = self._get_or_create_client(server_config)
-            tasks.append(
-                self._send_to_server(client, server_config.name, server_data)
-            )
-
-        # Отправляем параллельно
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Логируем результаты
-        for i, result in enumerate(results):
-            server_name = servers[i].name
-            if isinstance(result, Exception):
-                logger.error(
-                    f"Ошибка отправки на {server_name}: {result}",
-                    exc_info=True
+        async with asyncio.TaskGroup() as tg:
+            for server_name, client, impedance_key, batched in routes:
+                payload = (
+                    data
+                    if impedance_key is None
+                    else {**data, "impedance_key": impedance_key}
+                )
+                tg.create_task(
+                    self._send_to_server(client, server_name, payload, batched)
                 )
-            elif result:
-                logger.debug(f"Успешно отправлено на {server_name}")
-            else:
-                logger.warning(f"Не удалось отправить на {server_name}")
 
     async def _send_to_server(
         self,
-        client: TargetServerHTTPClient,
+        client: ITargetServerClient,
         server_name: str,
         data: Dict[str, Any],
-    ) -> bool:
+        batched: bool,
+    ) -> None:
         """
-        Отправляет данные на один сервер.
+        Отправляет данные на один сервер и логирует результат.
+
+        Для пакетных клиентов сообщение только помещается в буфер,
+        результат доставки логируется при отправке пакета.
 
         Args:
             client: HTTP клиент
             server_name: Название сервера (для логирования)
             data: Данные для отправки
-
-        Returns:
-            True, если отправка успешна
+            batched: Признак пакетной отправки
         """
         try:
-            return await client.send(data)
+            if batched:
+                await cast(IBatchingTargetServerClient, client).enqueue(data)
+                return
+            success = await client.send(data)
         except Exception as e:
-            logger.error(
-                f"Ошибка отправки на {server_name}: {e}",
-                exc_info=True
+            self._tracebacks.warning(
+                server_name, e, "Ошибка отправки на %s: %s", server_name, e
             )
-            return False
+            return
+
+        if success:
+            logger.debug("Успешно отправлено на %s", server_name)
+        else:
+            logger.warning("Не удалось отправить на %s", server_name)
 
     async def close_all_clients(self) -> None:
         """Закрывает все HTTP клиенты."""
@@ -184,6 +214,6 @@ class MessageProcessingService:
             client.close() for client in self._clients.values()
         ]
         await asyncio.gather(*tasks, return_exceptions=True)
-        self._clients.clear()
+        await self._http_pool.close()
         logger.info("Все HTTP клиенты закрыты")
 
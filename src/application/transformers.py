@@ -1,18 +1,25 @@
 """
 Трансформаторы сообщений.
 
-Преобразуют доменные модели в DTO для отправки на целевые серверы.
+Преобразуют доменные модели в данные для отправки на целевые серверы.
+Структура результата описана в OutgoingMessageDTO.
 """
 
 import logging
-from typing import Dict, Any, Optional
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Any, Optional, Tuple
 
 from src.domain.models import MeshtasticMessage, MessageType
 from src.domain.interfaces import IMessageTransformer
-from src.DTO.outgoing import OutgoingMessageDTO
 
 logger = logging.getLogger(__name__)
 
+_utcnow = datetime.utcnow
+_uuid4 = uuid.uuid4
+
+_VALID_TYPES = frozenset(MessageType)
+
 
 class MessageTransformer(IMessageTransformer):
     """Трансформатор сообщений Meshtastic в формат для целевых серверов."""
@@ -26,6 +33,30 @@ class MessageTransformer(IMessageTransformer):
         """
         self.default_impedance_key = default_impedance_key
 
+        # Пары (атрибут сообщения, ключ в теле запроса) для базовых полей
+        self._base_fields: Tuple[Tuple[str, str], ...] = (
+            ("message_id", "message_id"),
+            ("from_node", "from_node"),
+            ("to_node", "to_node"),
+            ("timestamp", "timestamp"),
+            ("rssi", "rssi"),
+            ("snr", "snr"),
+            ("hops_start", "hops_start"),
+            ("hops_limit", "hops_limit"),
+            ("hops_away", "hops_away"),
+            ("sender_node", "sender_node"),
+        )
+
+        # Построители специфичной части тела запроса по типу сообщения
+        self._builders: Dict[
+            MessageType, Callable[[MeshtasticMessage, Dict[str, Any]], None]
+        ] = {
+            MessageType.TEXT: self._text_body,
+            MessageType.NODEINFO: self._payload_update,
+            MessageType.POSITION: self._payload_update,
+            MessageType.TELEMETRY: self._payload_update,
+        }
+
     def transform(
         self,
         message: MeshtasticMessage,
@@ -41,112 +72,50 @@ class MessageTransformer(IMessageTransformer):
         Returns:
             Словарь с данными для отправки или None
         """
-        if not MessageType.is_valid(message.message_type):
+        if message.message_type not in _VALID_TYPES:
             logger.debug(
-                f"Пропущено сообщение неизвестного типа: {message.message_type}"
+                "Пропущено сообщение неизвестного типа: %s",
+                message.message_type_str,
             )
             return None
 
-        # Определяем ключ импедантности
-        key = impedance_key or self.default_impedance_key
-
-        # Формируем тело запроса
-        request_body = self._build_request_body(message)
-
-        # Формируем метаинформацию
-        meta = self._build_meta(message)
-
-        # Создаем DTO
-        dto = OutgoingMessageDTO(
-            impedance_key=key,
-            request_type=message.message_type.lower(),
-            request_body=request_body,
-            meta=meta,
-        )
-
-        return dto.to_dict()
-
-    def _build_request_body(self, message: MeshtasticMessage) -> Dict[str, Any]:
-        """
-        Формирует тело запроса из сообщения.
-
-        Args:
-            message: Сообщение Meshtastic
-
-        Returns:
-            Словарь с телом запроса
-        """
+        # Итоговый словарь по структуре OutgoingMessageDTO собирается
+        # за один проход, тело запроса заполняется на месте.
+        # datetime поля сериализуются HTTP клиентом в ISO формат.
         body: Dict[str, Any] = {}
-
-        # Базовые поля
-        if message.message_id:
-            body["message_id"] = message.message_id
-        if message.from_node:
-            body["from_node"] = message.from_node
-        if message.to_node:
-            body["to_node"] = message.to_node
-        if message.timestamp:
-            body["timestamp"] = message.timestamp
-
-        # RSSI и SNR в body
-        if message.rssi is not None:
-            body["rssi"] = message.rssi
-        if message.snr is not None:
-            body["snr"] = message.snr
-
-        # Hops информация
-        if message.hops_start is not None:
-            body["hops_start"] = message.hops_start
-        if message.hops_limit is not None:
-            body["hops_limit"] = message.hops_limit
-        if message.hops_away is not None:
-            body["hops_away"] = message.hops_away
-
-        # ID ноды, которая ретранслировала пакет (опционально)
-        if message.sender_node:
-            body["sender_node"] = message.sender_node
-
-        # Специфичные поля для разных типов сообщений
-        if message.message_type == MessageType.TEXT:
-            payload = message.raw_payload.get("payload", {})
-            if isinstance(payload, dict):
-                body["text"] = payload.get("text", "")
-            else:
-                body["text"] = message.raw_payload.get("text", "")
-
-        elif message.message_type == MessageType.NODEINFO:
-            payload = message.raw_payload.get("payload", {})
-            if isinstance(payload, dict):
-                body.update(payload)
-
-        elif message.message_type == MessageType.POSITION:
-            payload = message.raw_payload.get("payload", {})
-            if isinstance(payload, dict):
-                body.update(payload)
-
-        elif message.message_type == MessageType.TELEMETRY:
-            payload = message.raw_payload.get("payload", {})
-            if isinstance(payload, dict):
-                body.update(payload)
-
-        return body
-
-    def _build_meta(self, message: MeshtasticMessage) -> Dict[str, Any]:
-        """
-        Формирует метаинформацию о сообщении.
-
-        Args:
-            message: Сообщение Meshtastic
-
-        Returns:
-            Словарь с метаинформацией
-        """
-        meta: Dict[str, Any] = {
-            "topic": message.topic,
-            "received_at": message.received_at.isoformat(),
+        out: Dict[str, Any] = {
+            "impedance_key": impedance_key or self.default_impedance_key,
+            "idempotency_key": _uuid4().hex,
+            "request_type": message.message_type_str,
+            "request_body": body,
+            "meta": {
+                "topic": message.topic,
+                "received_at": message.received_at,
+            },
+            "sent_at": _utcnow(),
         }
 
-        # RSSI и SNR теперь в request_body, не в meta
-
-        return meta
+        # Базовые поля, RSSI/SNR, hops информация и ID ретранслятора
+        for attr, key in self._base_fields:
+            value = getattr(message, attr)
+            if value is not None:
+                body[key] = value
 
+        # Специфичные поля для разных типов сообщений
+        builder = self._builders.get(message.message_type)
+        if builder is not None:
+            builder(message, body)
+
+        return out
+
+    @staticmethod
+    def _text_body(message: MeshtasticMessage, body: Dict[str, Any]) -> None:
+        """Добавляет текст сообщения в тело запроса."""
+        body["text"] = message.payload.get("text", "")
+
+    @staticmethod
+    def _payload_update(
+        message: MeshtasticMessage, body: Dict[str, Any]
+    ) -> None:
+        """Добавляет поля декодированного payload в тело запроса."""
+        body.update(message.payload)
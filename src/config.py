@@ -7,11 +7,16 @@
 import os
 import logging
 from pathlib import Path
-from typing import List, Optional
-from pydantic import Field, field_validator
+from typing import FrozenSet, List, Optional
+from pydantic import Field, TypeAdapter, ValidationError, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+
 
 def setup_logging(level: Optional[str] = None) -> None:
     """Настраивает логирование."""
@@ -46,6 +51,20 @@ class MQTTBrokerConfig(BaseSettings):
         default="both",
         description="Формат сообщений: json | protobuf | both"
     )
+    worker_count: int = Field(
+        default=4,
+        gt=0,
+        description="Количество воркеров обработки входящих сообщений"
+    )
+    queue_size: int = Field(
+        default=10_000,
+        gt=0,
+        description="Размер очереди входящих сообщений"
+    )
+    include_raw_payload: bool = Field(
+        default=False,
+        description="Сохранять весь распарсенный payload в сообщении"
+    )
 
     @field_validator("qos")
     @classmethod
@@ -72,8 +91,8 @@ class TargetServerConfig(BaseSettings):
     name: str = Field(description="Название сервера")
     host: str = Field(description="IP адрес или домен")
     port: int = Field(description="Порт сервера")
-    allowed_types: List[str] = Field(
-        description="Список разрешенных типов сообщений"
+    allowed_types: FrozenSet[str] = Field(
+        description="Множество разрешенных типов сообщений"
     )
     enable: bool = Field(default=True, description="Включен ли сервер")
     impedance_key: Optional[str] = Field(
@@ -104,14 +123,38 @@ class TargetServerConfig(BaseSettings):
         default=2.0,
         description="Множитель для экспоненциальной задержки"
     )
+    retry_cap: float = Field(
+        default=30.0,
+        ge=0,
+        description="Максимальная задержка между попытками в секундах"
+    )
+    max_in_flight: int = Field(
+        default=32,
+        gt=0,
+        description="Максимальное количество одновременных отправок"
+    )
+    batch_enabled: bool = Field(
+        default=False,
+        description="Объединять сообщения в пакетные запросы (JSON массив)"
+    )
+    batch_max_size: int = Field(
+        default=128,
+        gt=0,
+        description="Максимальное количество сообщений в пакете"
+    )
+    batch_max_delay_ms: int = Field(
+        default=10,
+        ge=0,
+        description="Максимальное время накопления пакета в миллисекундах"
+    )
 
     @field_validator("allowed_types")
     @classmethod
-    def validate_allowed_types(cls, v: List[str]) -> List[str]:
+    def validate_allowed_types(cls, v: FrozenSet[str]) -> FrozenSet[str]:
         """Валидация типов сообщений."""
         allowed = {"text", "nodeinfo", "position", "telemetry"}
-        normalized = [t.lower().strip() for t in v]
-        invalid = [t for t in normalized if t not in allowed]
+        normalized = frozenset(t.lower().strip() for t in v)
+        invalid = sorted(normalized - allowed)
         if invalid:
             raise ValueError(
                 f"Недопустимые типы сообщений: {invalid}. "
@@ -120,6 +163,37 @@ class TargetServerConfig(BaseSettings):
         return normalized
 
 
+_TARGET_SERVERS_ADAPTER = TypeAdapter(List[TargetServerConfig])
+
+
+def _validate_target_servers(servers_data: list) -> List[TargetServerConfig]:
+    """
+    Валидирует список серверов из YAML.
+
+    Сначала весь список валидируется одним вызовом TypeAdapter.
+    Если в списке есть ошибочные записи, серверы валидируются по одному,
+    ошибочные записи логируются и пропускаются.
+
+    Args:
+        servers_data: Список словарей с конфигурацией серверов
+
+    Returns:
+        Список валидных конфигураций серверов
+    """
+    try:
+        return _TARGET_SERVERS_ADAPTER.validate_python(servers_data)
+    except ValidationError:
+        pass
+
+    servers = []
+    for server_data in servers_data:
+        try:
+            servers.append(TargetServerConfig(**server_data))
+        except Exception as e:
+            logging.warning(f"Ошибка при загрузке сервера из YAML: {e}")
+    return servers
+
+
 class AppConfig(BaseSettings):
     """Основная конфигурация приложения."""
 
@@ -155,6 +229,9 @@ class AppConfig(BaseSettings):
 
         Returns:
             Экземпляр AppConfig
+
+        Raises:
+            ValidationError: Если секция mqtt содержит недопустимые значения
         """
         if yaml_path is None:
             yaml_path = Path("targetServers.yaml")
@@ -172,7 +249,7 @@ class AppConfig(BaseSettings):
 
         try:
             with open(yaml_path, "r", encoding="utf-8") as f:
-                yaml_data = yaml.safe_load(f)
+                yaml_data = yaml.load(f, Loader=YamlSafeLoader)
 
             if not yaml_data:
                 logging.warning(f"YAML файл {yaml_path} пуст.")
@@ -182,17 +259,11 @@ class AppConfig(BaseSettings):
             if "target_servers" in yaml_data:
                 servers_data = yaml_data["target_servers"]
                 if isinstance(servers_data, list):
-                    target_servers = []
-                    for server_data in servers_data:
-                        try:
-                            server_config = TargetServerConfig(**server_data)
-                            if server_config.enable:
-                                target_servers.append(server_config)
-                        except Exception as e:
-                            logging.warning(
-                                f"Ошибка при загрузке сервера из YAML: {e}"
-                            )
-                            continue
+                    target_servers = [
+                        s
+                        for s in _validate_target_servers(servers_data)
+                        if s.enable
+                    ]
 
                     if target_servers:
                         config.target_servers = target_servers
@@ -200,12 +271,17 @@ class AppConfig(BaseSettings):
                             f"Загружено {len(target_servers)} целевых серверов из YAML"
                         )
 
-            # Загружаем MQTT конфигурацию, если есть
+            # Загружаем MQTT конфигурацию, если есть. Конфигурация
+            # собирается заново, чтобы значения из YAML прошли валидацию
             if "mqtt" in yaml_data:
-                mqtt_data = yaml_data["mqtt"]
-                for key, value in mqtt_data.items():
-                    if hasattr(config.mqtt, key):
-                        setattr(config.mqtt, key, value)
+                mqtt_data = {
+                    key: value
+                    for key, value in yaml_data["mqtt"].items()
+                    if key in MQTTBrokerConfig.model_fields
+                }
+                config.mqtt = MQTTBrokerConfig.model_validate(
+                    {**config.mqtt.model_dump(), **mqtt_data}
+                )
 
             # Загружаем общие настройки
             if "impedance_key" in yaml_data:
@@ -214,6 +290,9 @@ class AppConfig(BaseSettings):
             if "log_level" in yaml_data:
                 config.log_level = yaml_data["log_level"]
 
+        except ValidationError:
+            # Некорректные настройки MQTT должны останавливать запуск
+            raise
         except yaml.YAMLError as e:
             logging.error(f"Ошибка при парсинге YAML файла {yaml_path}: {e}")
         except Exception as e:
@@ -5,18 +5,33 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, TYPE_CHECKING
+from typing import (
+    Callable,
+    Optional,
+    List,
+    Dict,
+    Sequence,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
 
 if TYPE_CHECKING:
     from src.config import TargetServerConfig
     from src.domain.models import MeshtasticMessage
 
 
+# Данные MQTT сообщения: любой bytes-like объект, без копирования в bytes
+PayloadBuffer = Union[bytes, bytearray, memoryview]
+
+
 class IMessageParser(ABC):
     """Интерфейс для парсера сообщений."""
 
+    __slots__ = ()
+
     @abstractmethod
-    def parse(self, topic: str, payload: bytes) -> "MeshtasticMessage":
+    def parse(self, topic: str, payload: PayloadBuffer) -> "MeshtasticMessage":
         """
         Парсит сообщение из MQTT.
 
@@ -63,32 +78,85 @@ class ITargetServerClient(ABC):
         """
         pass
 
+    @abstractmethod
+    async def send_batch(self, batch: List[Dict]) -> bool:
+        """
+        Отправляет пакет сообщений одним запросом.
+
+        Args:
+            batch: Список данных для отправки
+
+        Returns:
+            True, если отправка успешна, False в противном случае
+        """
+        pass
+
     @abstractmethod
     async def close(self) -> None:
         """Закрывает соединение с сервером."""
         pass
 
 
+class IBatchingTargetServerClient(ITargetServerClient):
+    """Интерфейс для клиента с пакетной отправкой."""
+
+    @abstractmethod
+    async def enqueue(self, data: Dict) -> None:
+        """
+        Помещает данные в буфер пакетной отправки.
+
+        Результат доставки становится известен только при отправке пакета.
+
+        Args:
+            data: Данные для отправки
+        """
+        pass
+
+
+# Маршрут: (название сервера, клиент, ключ импедантности или None,
+# признак пакетной отправки). Клиент маршрута с признаком пакетной
+# отправки реализует IBatchingTargetServerClient
+Route = Tuple[str, ITargetServerClient, Optional[str], bool]
+
+# Таблица маршрутизации: тип сообщения -> маршруты
+RoutingTable = Dict[str, Tuple[Route, ...]]
+
+
 class ITargetServerRepository(ABC):
     """Интерфейс для репозитория целевых серверов."""
 
     @abstractmethod
-    def get_enabled_servers(self) -> List["TargetServerConfig"]:  # type: ignore
-        """Возвращает список включенных целевых серверов."""
+    def get_enabled_servers(self) -> Sequence["TargetServerConfig"]:  # type: ignore
+        """Возвращает включенные целевые серверы."""
         pass
 
     @abstractmethod
     def get_servers_for_message_type(
         self, message_type: str
-    ) -> List["TargetServerConfig"]:  # type: ignore
+    ) -> Sequence["TargetServerConfig"]:  # type: ignore
         """
-        Возвращает список серверов, которые принимают указанный тип сообщений.
+        Возвращает серверы, которые принимают указанный тип сообщений.
 
         Args:
             message_type: Тип сообщения
 
         Returns:
-            Список конфигураций серверов
+            Последовательность конфигураций серверов
         """
         pass
 
+    @abstractmethod
+    def build_routes(
+        self,
+        client_factory: Callable[["TargetServerConfig"], ITargetServerClient],
+    ) -> RoutingTable:
+        """
+        Строит таблицу маршрутизации по типам сообщений.
+
+        Args:
+            client_factory: Функция получения клиента для сервера
+
+        Returns:
+            Таблица маршрутизации
+        """
+        pass
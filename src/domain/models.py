@@ -4,80 +4,96 @@
 Определяет структуру данных для различных типов сообщений Meshtastic.
 """
 
-from datetime import datetime
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
-
-
-class MeshtasticMessage(BaseModel):
-    """Базовая модель сообщения от Meshtastic."""
-
-    topic: str = Field(description="MQTT топик, из которого получено сообщение")
-    raw_payload: Dict[str, Any] = Field(
-        description="Исходный payload (распарсенный)"
-    )
-    raw_payload_bytes: Optional[bytes] = Field(
-        default=None,
-        description="Исходный payload в сыром виде (bytes)",
-    )
-    received_at: datetime = Field(
-        default_factory=datetime.utcnow,
-        description="Время получения сообщения"
-    )
-    message_id: Optional[str] = Field(default=None, description="ID сообщения")
-    from_node: Optional[str] = Field(default=None, description="ID отправителя")
-    to_node: Optional[str] = Field(default=None, description="ID получателя")
-    message_type: Optional[str] = Field(
-        default=None,
-        description="Тип сообщения (text, nodeinfo, position, telemetry)"
-    )
-    timestamp: Optional[int] = Field(
-        default=None,
-        description="Unix timestamp сообщения"
-    )
-    rssi: Optional[int] = Field(
-        default=None,
-        description="RSSI (Received Signal Strength Indicator) в dBm"
-    )
-    snr: Optional[float] = Field(
-        default=None,
-        description="SNR (Signal-to-Noise Ratio) в dB"
-    )
-    sender_node: Optional[str] = Field(
-        default=None,
-        description="ID ноды, которая ретранслировала сообщение (relay_node)"
-    )
-    hops_start: Optional[int] = Field(
-        default=None,
-        description="Начальное количество допустимых переходов (hop_start)"
-    )
-    hops_limit: Optional[int] = Field(
-        default=None,
-        description="Оставшееся количество переходов (hop_limit)"
-    )
-    hops_away: Optional[int] = Field(
-        default=None,
-        description="Количество ретрансляций (hops_away = hops_start - hops_limit)"
-    )
-
-
-class MessageType:
-    """Константы типов сообщений Meshtastic."""
+
+# Начало эпохи Unix в наивном UTC, как у datetime.utcnow()
+_EPOCH = datetime(1970, 1, 1)
+
+
+class MessageType(str, Enum):
+    """Типы сообщений Meshtastic."""
 
     TEXT = "text"
     NODEINFO = "nodeinfo"
     POSITION = "position"
     TELEMETRY = "telemetry"
 
+    @classmethod
+    def resolve(cls, message_type: Any) -> Optional["MessageType"]:
+        """
+        Приводит тип сообщения к элементу MessageType.
+
+        Args:
+            message_type: Тип сообщения в любом регистре
+
+        Returns:
+            Элемент MessageType или None для неизвестного типа
+        """
+        if isinstance(message_type, cls):
+            return message_type
+        if not isinstance(message_type, str):
+            return None
+        return _MESSAGE_TYPES_BY_VALUE.get(message_type.lower())
+
     @classmethod
     def is_valid(cls, message_type: Optional[str]) -> bool:
         """Проверяет, является ли тип сообщения валидным."""
-        if not message_type:
-            return False
-        return message_type.lower() in {
-            cls.TEXT,
-            cls.NODEINFO,
-            cls.POSITION,
-            cls.TELEMETRY,
-        }
+        return cls.resolve(message_type) is not None
+
+
+_MESSAGE_TYPES_BY_VALUE: Dict[str, MessageType] = {
+    t.value: t for t in MessageType
+}
+
+
+@dataclass(slots=True)
+class MeshtasticMessage:
+    """
+    Базовая модель сообщения от Meshtastic.
+
+    Создается на каждое MQTT сообщение, поэтому реализована как dataclass
+    со slots без валидации: парсеры передают уже нормализованные значения.
+    """
+
+    # MQTT топик, из которого получено сообщение
+    topic: str
+    # Исходный payload (распарсенный), пустой, если парсер
+    # создан без include_raw_payload
+    raw_payload: Dict[str, Any]
+    # Декодированная специфичная для типа часть payload
+    payload: Dict[str, Any] = field(default_factory=dict)
+    # Время получения сообщения (Unix время в наносекундах)
+    received_at_ns: int = field(default_factory=time.time_ns)
+    # ID сообщения
+    message_id: Optional[str] = None
+    # ID отправителя
+    from_node: Optional[str] = None
+    # ID получателя
+    to_node: Optional[str] = None
+    # Тип сообщения (text, nodeinfo, position, telemetry)
+    message_type: Optional[MessageType] = None
+    # Строковое значение типа сообщения в нижнем регистре
+    message_type_str: Optional[str] = None
+    # Unix timestamp сообщения
+    timestamp: Optional[int] = None
+    # RSSI (Received Signal Strength Indicator) в dBm
+    rssi: Optional[int] = None
+    # SNR (Signal-to-Noise Ratio) в dB
+    snr: Optional[float] = None
+    # ID ноды, которая ретранслировала сообщение (relay_node)
+    sender_node: Optional[str] = None
+    # Начальное количество допустимых переходов (hop_start)
+    hops_start: Optional[int] = None
+    # Оставшееся количество переходов (hop_limit)
+    hops_limit: Optional[int] = None
+    # Количество ретрансляций (hops_away = hops_start - hops_limit)
+    hops_away: Optional[int] = None
 
+    @property
+    def received_at(self) -> datetime:
+        """Время получения сообщения в наивном UTC."""
+        return _EPOCH + timedelta(microseconds=self.received_at_ns // 1000)
@@ -5,40 +5,154 @@ HTTP клиент для отправки данных на целевые се
 """
 
 import asyncio
+import json
 import logging
-from typing import Dict, Any, Optional
+import random
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
 import aiohttp
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from src.config import TargetServerConfig
-from src.domain.interfaces import ITargetServerClient
+from src.domain.interfaces import (
+    IBatchingTargetServerClient,
+    ITargetServerClient,
+)
+from src.infrastructure.log_throttle import TracebackThrottle
 
 logger = logging.getLogger(__name__)
 
+# Сигнал остановки фоновой задачи пакетной отправки
+_STOP = object()
+
+
+def _json_default(value: Any) -> Any:
+    """Сериализует типы, которые stdlib json не поддерживает."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Тип {type(value).__name__} не сериализуется в JSON")
+
+
+def _dumps(data: Any) -> bytes:
+    """
+    Сериализует данные в JSON.
+
+    Использует orjson (datetime сериализуется нативно), иначе stdlib json.
+
+    Args:
+        data: Данные для сериализации
+
+    Returns:
+        JSON в байтах
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_json_default).encode("utf-8")
+
+
+class HttpClientPool:
+    """
+    Общая HTTP сессия для всех целевых серверов.
+
+    Все клиенты используют одну сессию и один TCPConnector, который
+    сам держит keep-alive соединения отдельно для каждого хоста.
+    """
+
+    def __init__(
+        self,
+        limit: int = 512,
+        limit_per_host: int = 64,
+        ttl_dns_cache: int = 300,
+        keepalive_timeout: float = 75,
+    ):
+        """
+        Создает пул без сессии, сессия создается при первом обращении.
+
+        Args:
+            limit: Максимальное число соединений всего
+            limit_per_host: Максимальное число соединений на один хост
+            ttl_dns_cache: Время жизни кэша DNS в секундах
+            keepalive_timeout: Время жизни простаивающего соединения
+        """
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._ttl_dns_cache = ttl_dns_cache
+        self._keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Возвращает общую сессию, создавая ее при первом обращении.
+
+        Должен вызываться из работающего event loop.
+
+        Returns:
+            HTTP сессия
+        """
+        session = self._session
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                ttl_dns_cache=self._ttl_dns_cache,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._session = session
+        return session
+
+    async def close(self) -> None:
+        """Закрывает общую сессию."""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
 
 class TargetServerHTTPClient(ITargetServerClient):
     """HTTP клиент для отправки данных на целевой сервер."""
 
-    def __init__(self, config: TargetServerConfig):
+    def __init__(
+        self,
+        config: TargetServerConfig,
+        pool: Optional[HttpClientPool] = None,
+    ):
         """
         Создает HTTP клиент.
 
         Args:
             config: Конфигурация целевого сервера
+            pool: Общий пул сессий. Если не указан, клиент создает
+                собственный пул и закрывает его в close()
         """
         self.config = config
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._owns_pool = pool is None
+        self._pool = pool if pool is not None else HttpClientPool()
+        self._timeout = aiohttp.ClientTimeout(total=config.timeout)
+        self._in_flight = asyncio.Semaphore(config.max_in_flight)
         self._base_url = f"http://{config.host}:{config.port}{config.path}"
+        self._base_headers = {"Content-Type": "application/json"}
+        self._tracebacks = TracebackThrottle(logger)
 
-    async def _ensure_session(self) -> None:
-        """Обеспечивает наличие активной сессии."""
-        if self._session is None or self._session.closed:
-            timeout = aiohttp.ClientTimeout(total=self.config.timeout)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+        # Задержки перед повторами (до разброса), ограниченные retry_cap
+        self._wait_schedule = tuple(
+            min(config.retry_cap, config.retry_delay * config.retry_backoff ** i)
+            for i in range(max(config.retry_max_attempts - 1, 0))
+        )
 
     async def send(self, data: Dict[str, Any]) -> bool:
         """
         Отправляет данные на целевой сервер с повторными попытками.
 
+        Одновременно выполняется не более max_in_flight отправок,
+        остальные ожидают освобождения слота.
+
         Args:
             data: Данные для отправки (должен содержать idempotency_key)
 
@@ -48,119 +162,379 @@ class TargetServerHTTPClient(ITargetServerClient):
         idempotency_key = data.get("idempotency_key")
         if not idempotency_key:
             logger.warning(
-                f"Отсутствует idempotency_key в данных для {self.config.name}"
+                "Отсутствует idempotency_key в данных для %s",
+                self.config.name,
             )
 
+        async with self._in_flight:
+            return await self._send_with_retry(data, idempotency_key)
+
+    async def send_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        """
+        Отправляет пакет сообщений одним запросом (JSON массив).
+
+        Каждый элемент пакета содержит собственный idempotency_key,
+        для самого пакета генерируется отдельный ключ в заголовке.
+
+        Args:
+            batch: Список сообщений для отправки
+
+        Returns:
+            True, если отправка успешна, False в противном случае
+        """
+        if not batch:
+            return True
+
+        async with self._in_flight:
+            return await self.send_batch_in_slot(batch)
+
+    async def acquire_slot(self) -> None:
+        """Ожидает свободный слот из max_in_flight одновременных отправок."""
+        await self._in_flight.acquire()
+
+    def release_slot(self) -> None:
+        """Освобождает слот, занятый acquire_slot()."""
+        self._in_flight.release()
+
+    async def send_batch_in_slot(self, batch: List[Dict[str, Any]]) -> bool:
+        """
+        Отправляет пакет в слоте, уже занятом через acquire_slot().
+
+        Args:
+            batch: Список сообщений для отправки
+
+        Returns:
+            True, если отправка успешна, False в противном случае
+        """
+        return await self._send_with_retry(batch, uuid.uuid4().hex)
+
+    async def _send_with_retry(
+        self,
+        data: Union[Dict[str, Any], List[Dict[str, Any]]],
+        idempotency_key: Optional[str],
+    ) -> bool:
+        """
+        Отправляет данные с повторными попытками согласно конфигурации.
+
+        Данные сериализуются один раз, повторные попытки отправляют
+        те же байты.
+
+        Args:
+            data: Сообщение или пакет сообщений
+            idempotency_key: Ключ идемпотентности запроса
+
+        Returns:
+            True, если отправка успешна, False в противном случае
+        """
+        payload = _dumps(data)
+
         if not self.config.retry_enabled:
-            return await self._send_once(data)
+            return await self._send_once(payload, idempotency_key)
 
         max_attempts = self.config.retry_max_attempts
-        delay = self.config.retry_delay
-        backoff = self.config.retry_backoff
 
         for attempt in range(1, max_attempts + 1):
-            success = await self._send_once(data)
+            success = await self._send_once(payload, idempotency_key)
             
             if success:
                 if attempt > 1:
                     logger.info(
-                        f"Успешно отправлено на {self.config.name} "
-                        f"с попытки {attempt}/{max_attempts}, "
-                        f"idempotency_key={idempotency_key}"
+                        "Успешно отправлено на %s с попытки %d/%d, "
+                        "idempotency_key=%s",
+                        self.config.name,
+                        attempt,
+                        max_attempts,
+                        idempotency_key,
                     )
                 return True
 
             # Если это не последняя попытка, ждем перед повтором
             if attempt < max_attempts:
-                wait_time = delay * (backoff ** (attempt - 1))
+                # Задержка случайно растягивается или сжимается,
+                # чтобы клиенты не повторяли запросы одновременно
+                wait_time = self._wait_schedule[attempt - 1]
+                wait_time *= 0.5 + random.random()
                 logger.warning(
-                    f"Попытка {attempt}/{max_attempts} не удалась для "
-                    f"{self.config.name}, повтор через {wait_time:.2f}с, "
-                    f"idempotency_key={idempotency_key}"
+                    "Попытка %d/%d не удалась для %s, повтор через %.2fс, "
+                    "idempotency_key=%s",
+                    attempt,
+                    max_attempts,
+                    self.config.name,
+                    wait_time,
+                    idempotency_key,
                 )
                 await asyncio.sleep(wait_time)
             else:
                 logger.error(
-                    f"Все {max_attempts} попыток отправки на {self.config.name} "
-                    f"не удались, idempotency_key={idempotency_key}"
+                    "Все %d попыток отправки на %s не удались, "
+                    "idempotency_key=%s",
+                    max_attempts,
+                    self.config.name,
+                    idempotency_key,
                 )
 
         return False
 
-    async def _send_once(self, data: Dict[str, Any]) -> bool:
+    async def _send_once(
+        self,
+        payload: bytes,
+        idempotency_key: Optional[str],
+    ) -> bool:
         """
         Отправляет данные на целевой сервер один раз.
 
         Args:
-            data: Данные для отправки
+            payload: Сериализованное в JSON сообщение или пакет сообщений
+            idempotency_key: Ключ идемпотентности запроса
 
         Returns:
             True, если отправка успешна, False в противном случае
         """
-        await self._ensure_session()
-
-        idempotency_key = data.get("idempotency_key", "unknown")
+        session = self._pool.get_session()
+        idempotency_key = idempotency_key or "unknown"
 
         try:
             # Добавляем заголовок с ключом идемпотентности
             headers = {
-                "Content-Type": "application/json",
+                **self._base_headers,
                 "Idempotency-Key": idempotency_key,
             }
 
-            async with self._session.post(
+            async with session.post(
                 self._base_url,
-                json=data,
+                data=payload,
                 headers=headers,
+                timeout=self._timeout,
             ) as response:
                 if response.status in (200, 201, 202):
                     logger.debug(
-                        f"Успешно отправлено на {self.config.name}: "
-                        f"status={response.status}, "
-                        f"idempotency_key={idempotency_key}"
+                        "Успешно отправлено на %s: status=%d, "
+                        "idempotency_key=%s",
+                        self.config.name,
+                        response.status,
+                        idempotency_key,
                     )
                     return True
                 elif response.status == 500:
                     # 500 - внутренняя ошибка сервера, нужно повторить
                     text = await response.text()
                     logger.warning(
-                        f"Ошибка 500 от {self.config.name}: {text}, "
-                        f"idempotency_key={idempotency_key}"
+                        "Ошибка 500 от %s: %s, idempotency_key=%s",
+                        self.config.name,
+                        text,
+                        idempotency_key,
                     )
                     return False
                 else:
                     # Другие ошибки (4xx) - не повторяем
                     text = await response.text()
                     logger.warning(
-                        f"Ошибка отправки на {self.config.name}: "
-                        f"status={response.status}, response={text}, "
-                        f"idempotency_key={idempotency_key}"
+                        "Ошибка отправки на %s: status=%d, response=%s, "
+                        "idempotency_key=%s",
+                        self.config.name,
+                        response.status,
+                        text,
+                        idempotency_key,
                     )
                     return False
         except aiohttp.ClientError as e:
-            logger.error(
-                f"Ошибка соединения с {self.config.name}: {e}, "
-                f"idempotency_key={idempotency_key}",
-                exc_info=True
+            self._tracebacks.warning(
+                self.config.name,
+                e,
+                "Ошибка соединения с %s: %s, idempotency_key=%s",
+                self.config.name,
+                e,
+                idempotency_key,
             )
             return False
         except asyncio.TimeoutError:
-            logger.error(
-                f"Таймаут при отправке на {self.config.name}, "
-                f"idempotency_key={idempotency_key}"
+            logger.warning(
+                "Таймаут при отправке на %s, idempotency_key=%s",
+                self.config.name,
+                idempotency_key,
             )
             return False
         except Exception as e:
-            logger.error(
-                f"Неожиданная ошибка при отправке на {self.config.name}: {e}, "
-                f"idempotency_key={idempotency_key}",
-                exc_info=True
+            self._tracebacks.warning(
+                self.config.name,
+                e,
+                "Неожиданная ошибка при отправке на %s: %s, "
+                "idempotency_key=%s",
+                self.config.name,
+                e,
+                idempotency_key,
             )
             return False
 
     async def close(self) -> None:
-        """Закрывает HTTP сессию."""
-        if self._session and not self._session.closed:
-            await self._session.close()
-            logger.debug(f"Закрыта сессия для {self.config.name}")
+        """Закрывает HTTP сессию, если клиент владеет пулом."""
+        if self._owns_pool:
+            await self._pool.close()
+            logger.debug("Закрыта сессия для %s", self.config.name)
+
+
+class BatchingHTTPClient(IBatchingTargetServerClient):
+    """
+    Клиент, объединяющий сообщения в пакеты перед отправкой.
+
+    Сообщения накапливаются в очереди и отправляются одним запросом,
+    когда набирается batch_max_size сообщений или истекает
+    batch_max_delay_ms с момента получения первого сообщения пакета.
+    Каждый пакет отправляется отдельной задачей, одновременно в отправке
+    находится не более max_in_flight пакетов.
+    """
+
+    def __init__(self, client: TargetServerHTTPClient):
+        """
+        Создает пакетный клиент.
+
+        Args:
+            client: HTTP клиент целевого сервера
+        """
+        self.config = client.config
+        self._client = client
+        self._max_batch = client.config.batch_max_size
+        self._max_delay = client.config.batch_max_delay_ms / 1000
+        # Буфер ограничен, чтобы при медленном сервере enqueue() ожидал
+        # и давление передавалось в очередь входящих сообщений
+        self._queue: asyncio.Queue = asyncio.Queue(
+            maxsize=self._max_batch * client.config.max_in_flight
+        )
+        self._worker: Optional[asyncio.Task] = None
+        self._tracebacks = TracebackThrottle(logger)
+        self._flushes: Set[asyncio.Task] = set()
+
+    def _ensure_worker(self) -> None:
+        """Запускает фоновую задачу отправки пакетов при первом использовании."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def enqueue(self, data: Dict[str, Any]) -> None:
+        """
+        Помещает сообщение в очередь на пакетную отправку.
+
+        Ожидает, если буфер заполнен.
+
+        Args:
+            data: Данные для отправки
+        """
+        self._ensure_worker()
+        await self._queue.put(data)
+
+    async def send(self, data: Dict[str, Any]) -> bool:
+        """
+        Отправляет одно сообщение напрямую, минуя буфер.
+
+        Args:
+            data: Данные для отправки
+
+        Returns:
+            True, если отправка успешна, False в противном случае
+        """
+        return await self._client.send(data)
+
+    async def send_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        """
+        Отправляет пакет сообщений напрямую, минуя буфер.
+
+        Args:
+            batch: Список сообщений для отправки
+
+        Returns:
+            True, если отправка успешна, False в противном случае
+        """
+        return await self._client.send_batch(batch)
+
+    async def _collect_batch(self) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Ожидает первое сообщение и добирает пакет до лимита или таймаута.
+
+        Returns:
+            Пакет сообщений и признак получения сигнала остановки
+        """
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_delay
+
+        while len(batch) < self._max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    async def _run(self) -> None:
+        """
+        Фоновый цикл сбора пакетов.
+
+        Перед отправкой пакета ожидается свободный слот клиента, поэтому
+        при занятых слотах сообщения продолжают копиться в буфере.
+        """
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._collect_batch()
+            if not batch:
+                continue
+
+            await self._client.acquire_slot()
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Отправляет накопленный пакет, логирует результат и освобождает слот.
+
+        Args:
+            batch: Список сообщений для отправки
+        """
+        try:
+            if await self._client.send_batch_in_slot(batch):
+                logger.debug(
+                    "Успешно отправлен пакет из %d сообщений на %s",
+                    len(batch),
+                    self.config.name,
+                )
+            else:
+                logger.warning(
+                    "Не удалось отправить пакет из %d сообщений на %s",
+                    len(batch),
+                    self.config.name,
+                )
+        except Exception as e:
+            self._tracebacks.warning(
+                self.config.name,
+                e,
+                "Ошибка отправки пакета на %s: %s",
+                self.config.name,
+                e,
+            )
+        finally:
+            self._client.release_slot()
+
+    async def close(self) -> None:
+        """Отправляет остаток буфера, останавливает фоновую задачу и закрывает клиент."""
+        if self._worker is not None and not self._worker.done():
+            await self._queue.put(_STOP)
+            await self._worker
+        self._worker = None
 
+        await self._client.close()
@@ -0,0 +1,65 @@
+"""
+Ограничение частоты логирования traceback.
+
+Используется на путях обработки каждого сообщения, где при массовых
+отказах форматирование traceback на каждую ошибку слишком дорого.
+"""
+
+import logging
+import time
+from typing import Any, Dict
+
+# Минимальный интервал (в секундах) между логированием traceback
+# для одного источника ошибок
+TRACEBACK_LOG_INTERVAL = 30.0
+
+
+class TracebackThrottle:
+    """
+    Логирует ошибки на уровне warning.
+
+    Traceback прикладывается не чаще одного раза в interval секунд
+    для каждого источника, остальные ошибки логируются без него.
+    """
+
+    __slots__ = ("_logger", "_interval", "_last_traceback_time")
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        interval: float = TRACEBACK_LOG_INTERVAL,
+    ):
+        """
+        Создает ограничитель.
+
+        Args:
+            logger: Логгер для записи ошибок
+            interval: Минимальный интервал между traceback в секундах
+        """
+        self._logger = logger
+        self._interval = interval
+        self._last_traceback_time: Dict[str, float] = {}
+
+    def warning(
+        self,
+        source: str,
+        error: BaseException,
+        msg: str,
+        *args: Any,
+    ) -> None:
+        """
+        Логирует ошибку.
+
+        Args:
+            source: Источник ошибки (название сервера или этап обработки)
+            error: Исключение
+            msg: Шаблон сообщения в %-формате
+            *args: Аргументы шаблона
+        """
+        now = time.monotonic()
+        last = self._last_traceback_time.get(source)
+        if last is None or now - last > self._interval:
+            self._last_traceback_time[source] = now
+            self._logger.warning(msg, *args, exc_info=error)
+        else:
+            self._logger.warning(msg, *args)
@@ -4,16 +4,24 @@ MQTT клиент для подключения к брокеру.
 Управляет подключением и подпиской на топики.
 """
 
+import asyncio
 import logging
-from typing import Optional, Callable, Awaitable
+from typing import Optional, Callable, Awaitable, Tuple
 
 from aiomqtt import Client as MQTTClient
 from aiomqtt.exceptions import MqttError
 
 from src.config import MQTTBrokerConfig
+from src.domain.interfaces import PayloadBuffer
 
 logger = logging.getLogger(__name__)
 
+MessageCallback = Callable[[str, PayloadBuffer], Awaitable[None]]
+
+# Максимальное время (в секундах) ожидания обработки очереди
+# после завершения потока сообщений
+_QUEUE_DRAIN_TIMEOUT = 10.0
+
 
 class MQTTClientManager:
     """Менеджер MQTT клиента."""
@@ -28,6 +36,7 @@ class MQTTClientManager:
         self.config = config
         self._client: Optional[MQTTClient] = None
         self._connected = False
+        self._dropped_messages = 0
 
     @property
     def is_connected(self) -> bool:
@@ -69,11 +78,20 @@ class MQTTClientManager:
     async def subscribe(
         self,
         topic: str,
-        callback: Callable[[str, bytes], Awaitable[None]],
+        callback: MessageCallback,
     ) -> None:
         """
         Подписывается на топик и устанавливает обработчик сообщений.
 
+        Сообщения помещаются в ограниченную очередь и обрабатываются
+        пулом из worker_count воркеров, чтобы медленный обработчик
+        не останавливал прием из MQTT. Если очередь переполнена,
+        сообщение отбрасывается и учитывается в счетчике отброшенных.
+
+        После завершения потока сообщений воркеры дорабатывают очередь
+        не дольше _QUEUE_DRAIN_TIMEOUT секунд. Необработанные к остановке
+        сообщения также учитываются в счетчике отброшенных.
+
         Args:
             topic: MQTT топик для подписки
             callback: Асинхронная функция-обработчик (topic, payload)
@@ -84,18 +102,79 @@ class MQTTClientManager:
         await self._client.subscribe(topic, qos=self.config.qos)
         logger.info(f"Подписан на топик: {topic}")
 
-        # Обрабатываем сообщения в цикле
-        async for message in self._client.messages:
+        queue: asyncio.Queue[Tuple[str, PayloadBuffer]] = asyncio.Queue(
+            maxsize=self.config.queue_size
+        )
+        workers = [
+            asyncio.create_task(self._worker_loop(queue, callback))
+            for _ in range(self.config.worker_count)
+        ]
+
+        try:
+            # Принимаем сообщения в цикле и передаем их воркерам
+            async for message in self._client.messages:
+                try:
+                    queue.put_nowait((message.topic.value, message.payload))
+                except asyncio.QueueFull:
+                    self._dropped_messages += 1
+                    if self._dropped_messages % 1000 == 1:
+                        logger.warning(
+                            "Очередь входящих сообщений переполнена, "
+                            "сообщение отброшено (всего отброшено: %d)",
+                            self._dropped_messages,
+                        )
+
+            # Поток сообщений завершился: даем воркерам обработать очередь
+            try:
+                await asyncio.wait_for(queue.join(), _QUEUE_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Очередь входящих сообщений не обработана за %.0fс",
+                    _QUEUE_DRAIN_TIMEOUT,
+                )
+        finally:
+            discarded = queue.qsize()
+            if discarded:
+                self._dropped_messages += discarded
+                logger.warning(
+                    "При остановке отброшено %d сообщений из очереди",
+                    discarded,
+                )
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker_loop(
+        self,
+        queue: "asyncio.Queue[Tuple[str, PayloadBuffer]]",
+        callback: MessageCallback,
+    ) -> None:
+        """
+        Обрабатывает сообщения из очереди входящих сообщений.
+
+        Args:
+            queue: Очередь входящих сообщений
+            callback: Асинхронная функция-обработчик (topic, payload)
+        """
+        while True:
+            topic, payload = await queue.get()
             try:
-                await callback(message.topic.value, message.payload)
+                await callback(topic, payload)
             except Exception as e:
                 logger.error(
-                    f"Ошибка обработки сообщения: {e}",
-                    exc_info=True
+                    "Ошибка обработки сообщения: %s", e, exc_info=True
                 )
+            finally:
+                queue.task_done()
 
     async def disconnect(self) -> None:
         """Отключается от MQTT брокера."""
+        if self._dropped_messages:
+            logger.warning(
+                "Всего отброшено сообщений из-за переполнения очереди: %d",
+                self._dropped_messages,
+            )
+
         if not self._client:
             return
 
@@ -7,26 +7,98 @@
 import base64
 import json
 import logging
-from typing import Dict, Any, Optional
+import re
+import struct
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+    _JSON_DECODE_ERRORS: tuple = (
+        orjson.JSONDecodeError,
+        json.JSONDecodeError,
+        UnicodeDecodeError,
+    )
+except ImportError:
+    ORJSON_AVAILABLE = False
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)
 
 try:
     from google.protobuf.json_format import MessageToDict
-    from meshtastic.protobuf import mqtt_pb2, mesh_pb2, telemetry_pb2
+    from google.protobuf.message import DecodeError
+    from meshtastic.protobuf import (
+        mqtt_pb2,
+        mesh_pb2,
+        portnums_pb2,
+        telemetry_pb2,
+    )
 
     PROTOBUF_AVAILABLE = True
+    # Числовое значение portnum -> имя (как в MessageToDict)
+    _PORTNUM_NAMES: Dict[int, str] = {
+        value: name for name, value in portnums_pb2.PortNum.items()
+    }
 except ImportError:
     PROTOBUF_AVAILABLE = False
+    _PORTNUM_NAMES = {}
 
-from src.domain.models import MeshtasticMessage
-from src.domain.interfaces import IMessageParser
+from src.domain.models import MeshtasticMessage, MessageType
+from src.domain.interfaces import IMessageParser, PayloadBuffer
 
 logger = logging.getLogger(__name__)
 
+_HEX_RE = re.compile(r"[0-9a-fA-F]+")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_int(node_id: int) -> str:
+    """Нормализует числовой node ID к формату "!hex"."""
+    return f"!{node_id:x}"
+
+
+@lru_cache(maxsize=4096)
+def _normalize_str(node_id: str) -> Optional[str]:
+    """Нормализует строковый node ID к формату "!hex"."""
+    node_str = node_id.strip()
+    if not node_str:
+        return None
+
+    if node_str.startswith("!"):
+        if len(node_str) == 1:
+            return None
+        return node_str.lower()
+
+    # Обычный случай - строка из hex цифр без префикса
+    if _HEX_RE.fullmatch(node_str):
+        return f"!{int(node_str, 16):x}"
+
+    if node_str.startswith(("0x", "0X")):
+        hex_part = node_str[2:]
+        if not hex_part:
+            return None
+        try:
+            return f"!{int(hex_part, 16):x}"
+        except ValueError:
+            return f"!{hex_part.lower()}"
+
+    try:
+        return f"!{int(node_str, 16):x}"
+    except ValueError:
+        try:
+            return f"!{int(node_str, 10):x}"
+        except ValueError:
+            return f"!{node_str.lower()}"
+
 
 def _normalize_node_id(node_id: Any) -> Optional[str]:
     """
     Нормализует node ID к единому формату "!hex".
 
+    Одни и те же ноды встречаются в сети постоянно, поэтому результаты
+    нормализации чисел и строк кешируются.
+
     Args:
         node_id: Node ID в любом формате
 
@@ -38,126 +110,293 @@ def _normalize_node_id(node_id: Any) -> Optional[str]:
 
     try:
         if isinstance(node_id, int):
-            return f"!{hex(node_id)[2:]}"
+            return _normalize_int(node_id)
         elif isinstance(node_id, str):
-            node_str = node_id.strip()
-            if not node_str:
-                return None
-
-            if node_str.startswith("!"):
-                hex_part = node_str[1:]
-                if not hex_part:
-                    return None
-                try:
-                    int(hex_part, 16)
-                    return f"!{hex_part.lower()}"
-                except ValueError:
-                    return f"!{hex_part.lower()}"
-
-            if node_str.startswith(("0x", "0X")):
-                hex_part = node_str[2:]
-                if not hex_part:
-                    return None
-                try:
-                    num = int(hex_part, 16)
-                    return f"!{hex(num)[2:]}"
-                except ValueError:
-                    return f"!{hex_part.lower()}"
-
-            try:
-                num = int(node_str, 16)
-                return f"!{hex(num)[2:]}"
-            except ValueError:
-                try:
-                    num = int(node_str, 10)
-                    return f"!{hex(num)[2:]}"
-                except ValueError:
-                    return f"!{node_str.lower()}"
+            return _normalize_str(node_id)
         else:
-            return _normalize_node_id(str(node_id))
+            return _normalize_str(str(node_id))
     except Exception as e:
-        logger.warning(f"Ошибка нормализации node_id: {node_id}, error: {e}")
+        logger.warning(
+            "Ошибка нормализации node_id: %s, error: %s", node_id, e
+        )
+        return None
+
+
+# Пробельные символы JSON и символы, с которых начинается JSON документ
+_JSON_WHITESPACE = frozenset(b" \t\r\n")
+_JSON_START = frozenset(b"{[")
+
+
+def _looks_like_json(payload: PayloadBuffer) -> bool:
+    """
+    Проверяет, начинается ли payload как JSON документ.
+
+    Смотрит только на первый непробельный байт. Protobuf конверт
+    начинается с байта 0x0a, поэтому проверка заканчивается
+    на втором байте без копирования данных.
+
+    Args:
+        payload: Данные в виде bytes-like объекта
+
+    Returns:
+        True, если первый непробельный байт - "{" или "["
+    """
+    for byte in payload:
+        if byte not in _JSON_WHITESPACE:
+            return byte in _JSON_START
+    return False
+
+
+def _loads_json(payload: PayloadBuffer) -> Any:
+    """
+    Разбирает JSON из bytes-like объекта.
+
+    orjson разбирает буфер напрямую, без промежуточной str. Если данные,
+    похожие на JSON, содержат невалидный UTF-8, они разбираются повторно
+    через stdlib с заменой невалидных символов, как и без orjson.
+
+    Args:
+        payload: Данные в виде bytes-like объекта
+
+    Returns:
+        Распарсенный JSON
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            if not _looks_like_json(payload):
+                raise
+
+    payload_str = bytes(payload).decode("utf-8", errors="replace")
+    return json.loads(payload_str)
+
+
+# Известные portnum Meshtastic и соответствующие типы сообщений
+_PORTNUM_TO_TYPE: Dict[str, str] = {
+    "TEXT_MESSAGE_APP": "text",
+    "TEXT_MESSAGE_COMPRESSED_APP": "text",
+    "NODEINFO_APP": "nodeinfo",
+    "POSITION_APP": "position",
+    "TELEMETRY_APP": "telemetry",
+}
+
+# Правила по подстроке для неизвестных вариантов portnum (порядок важен)
+_PORTNUM_SUBSTR_RULES = (
+    ("text_message", "text"),
+    ("nodeinfo", "nodeinfo"),
+    ("position", "position"),
+    ("telemetry", "telemetry"),
+)
+
+
+@lru_cache(maxsize=256)
+def _portnum_to_type(portnum: Any) -> Optional[str]:
+    """
+    Определяет тип сообщения по portnum.
+
+    Известные portnum разрешаются по словарю, остальные - по подстроке.
+    Результат кешируется, поэтому неподдерживаемые portnum (ROUTING_APP
+    и т.п.) тоже проверяются по подстрокам только один раз.
+
+    Args:
+        portnum: Имя portnum (например, "TEXT_MESSAGE_APP")
+
+    Returns:
+        Тип сообщения или None для неподдерживаемых portnum
+    """
+    portnum_str = str(portnum)
+    message_type = _PORTNUM_TO_TYPE.get(portnum_str.upper())
+    if message_type is not None:
+        return message_type
+
+    portnum_lower = portnum_str.lower()
+    return next(
+        (t for sub, t in _PORTNUM_SUBSTR_RULES if sub in portnum_lower),
+        None,
+    )
+
+
+_FLOAT32 = struct.Struct("<f")
+
+
+def _shortest_float32(value: float) -> float:
+    """
+    Возвращает кратчайшее десятичное представление float32 значения.
+
+    protobuf хранит float как float32, и прямое чтение дает, например,
+    5.300000190734863 вместо 5.3. MessageToDict выдает кратчайшее
+    представление, этот helper воспроизводит такое же поведение.
+    """
+    for precision in range(6, 10):
+        rounded = float(f"{value:.{precision}g}")
+        if _FLOAT32.unpack(_FLOAT32.pack(rounded))[0] == value:
+            return rounded
+    return value
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Приводит значение к int, возвращает None, если это невозможно."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
         return None
 
 
+# Поля payload, общие для JSON и Protobuf сообщений, в порядке распаковки
+# в _build_message
+_MESSAGE_FIELDS = (
+    "id",
+    "from",
+    "sender",
+    "to",
+    "hop_start",
+    "hop_limit",
+    "rssi",
+    "snr",
+)
+
+
+def _build_message(
+    raw_payload: Dict[str, Any],
+    topic: str,
+    message_type: Optional[MessageType],
+    payload: Dict[str, Any],
+    timestamp: Any,
+    hops_away: Optional[int],
+    include_raw_payload: bool,
+) -> MeshtasticMessage:
+    """
+    Создает MeshtasticMessage из общих полей распарсенного payload.
+
+    Общая часть JSON и Protobuf парсеров: различаются только
+    источник timestamp и способ получения hops_away.
+
+    Args:
+        raw_payload: Распарсенный payload
+        topic: MQTT топик
+        message_type: Тип сообщения, определенный парсером
+        payload: Специфичная для типа часть payload
+        timestamp: Unix timestamp сообщения
+        hops_away: Количество ретрансляций
+        include_raw_payload: Сохранить raw_payload в сообщении
+
+    Returns:
+        MeshtasticMessage
+    """
+    (
+        message_id,
+        from_node,
+        sender_node,
+        to_node,
+        hop_start,
+        hop_limit,
+        rssi,
+        snr,
+    ) = map(raw_payload.get, _MESSAGE_FIELDS)
+
+    return MeshtasticMessage(
+        topic=topic,
+        raw_payload=raw_payload if include_raw_payload else {},
+        payload=payload,
+        message_id=str(message_id) if message_id else None,
+        from_node=_normalize_node_id(from_node),
+        sender_node=_normalize_node_id(sender_node),
+        to_node=_normalize_node_id(to_node),
+        message_type=message_type,
+        message_type_str=message_type.value if message_type else None,
+        timestamp=int(timestamp) if timestamp is not None else None,
+        rssi=int(rssi) if rssi is not None else None,
+        snr=float(snr) if snr is not None else None,
+        hops_start=int(hop_start) if hop_start is not None else None,
+        hops_limit=int(hop_limit) if hop_limit is not None else None,
+        hops_away=hops_away,
+    )
+
+
 class JsonMessageParser(IMessageParser):
     """Парсер JSON сообщений от Meshtastic."""
 
-    def parse(self, topic: str, payload: bytes) -> MeshtasticMessage:
+    __slots__ = ("include_raw_payload",)
+
+    def __init__(self, include_raw_payload: bool = False):
+        """
+        Создает парсер.
+
+        Args:
+            include_raw_payload: Сохранять весь распарсенный payload
+                в MeshtasticMessage.raw_payload
+        """
+        self.include_raw_payload = include_raw_payload
+
+    def parse(self, topic: str, payload: PayloadBuffer) -> MeshtasticMessage:
         """
         Парсит JSON payload.
 
         Args:
             topic: MQTT топик
-            payload: Данные в байтах
+            payload: Данные в виде bytes-like объекта
 
         Returns:
             MeshtasticMessage
         """
-        payload_str = payload.decode("utf-8", errors="replace")
-        raw_payload: Dict[str, Any] = json.loads(payload_str)
+        raw_payload: Dict[str, Any] = _loads_json(payload)
 
-        return self._create_message(raw_payload, topic, payload)
+        return self._create_message(raw_payload, topic)
 
     def _create_message(
         self,
         raw_payload: Dict[str, Any],
         topic: str,
-        raw_payload_bytes: bytes,
     ) -> MeshtasticMessage:
         """Создает MeshtasticMessage из распарсенных данных."""
-        message_type = raw_payload.get("type")
-        message_id = raw_payload.get("id")
-        from_node = raw_payload.get("from")
-        sender_node = raw_payload.get("sender")
-        to_node = raw_payload.get("to")
-        hop_start = raw_payload.get("hop_start")
-        hop_limit = raw_payload.get("hop_limit")
-        hops_away = raw_payload.get("hops_away")
-        timestamp = raw_payload.get("rx_time") or raw_payload.get("timestamp")
-        rssi = raw_payload.get("rssi")
-        snr = raw_payload.get("snr")
-
-        from_node_str = _normalize_node_id(from_node)
-        sender_node_str = _normalize_node_id(sender_node)
-        to_node_str = _normalize_node_id(to_node)
+        message_type = MessageType.resolve(raw_payload.get("type"))
+
+        payload = raw_payload.get("payload", {})
+        if not isinstance(payload, dict):
+            # Текст может быть передан на верхнем уровне сообщения
+            payload = (
+                {"text": raw_payload.get("text", "")}
+                if message_type is MessageType.TEXT
+                else {}
+            )
 
         # Для JSON hops_away может быть напрямую указан
-        hops_away_int = None
-        if hops_away is not None:
-            try:
-                hops_away_int = int(hops_away)
-            except (ValueError, TypeError):
-                hops_away_int = None
-
-        return MeshtasticMessage(
-            topic=topic,
-            raw_payload=raw_payload,
-            raw_payload_bytes=raw_payload_bytes,
-            message_id=str(message_id) if message_id else None,
-            from_node=from_node_str,
-            sender_node=sender_node_str,
-            to_node=to_node_str,
-            message_type=message_type,
-            timestamp=timestamp,
-            rssi=int(rssi) if rssi is not None else None,
-            snr=float(snr) if snr is not None else None,
-            hops_start=int(hop_start) if hop_start is not None else None,
-            hops_limit=int(hop_limit) if hop_limit is not None else None,
-            hops_away=hops_away_int,
+        return _build_message(
+            raw_payload,
+            topic,
+            message_type,
+            payload,
+            timestamp=raw_payload.get("rx_time") or raw_payload.get("timestamp"),
+            hops_away=_to_int(raw_payload.get("hops_away")),
+            include_raw_payload=self.include_raw_payload,
         )
 
 
 class ProtobufMessageParser(IMessageParser):
     """Парсер Protobuf сообщений от Meshtastic."""
 
-    def parse(self, topic: str, payload: bytes) -> MeshtasticMessage:
+    __slots__ = ("include_raw_payload",)
+
+    def __init__(self, include_raw_payload: bool = False):
+        """
+        Создает парсер.
+
+        Args:
+            include_raw_payload: Сохранять весь распарсенный payload
+                в MeshtasticMessage.raw_payload
+        """
+        self.include_raw_payload = include_raw_payload
+
+    def parse(self, topic: str, payload: PayloadBuffer) -> MeshtasticMessage:
         """
         Парсит Protobuf payload.
 
         Args:
             topic: MQTT топик
-            payload: Данные в байтах
+            payload: Данные в виде bytes-like объекта
 
         Returns:
             MeshtasticMessage
@@ -169,59 +408,53 @@ class ProtobufMessageParser(IMessageParser):
             )
 
         raw_payload = self._parse_protobuf_payload(payload)
-        return self._create_message(raw_payload, topic, payload)
+        return self._create_message(raw_payload, topic)
 
-    def _parse_protobuf_payload(self, payload: bytes) -> Dict[str, Any]:
+    def _parse_protobuf_payload(
+        self, payload: PayloadBuffer
+    ) -> Dict[str, Any]:
         """Парсит protobuf payload в словарь."""
         envelope = mqtt_pb2.ServiceEnvelope()
         envelope.ParseFromString(payload)
 
-        envelope_dict = MessageToDict(
-            envelope,
-            preserving_proto_field_name=True,
-        )
-
-        packet = (
-            envelope_dict.get("packet", {})
-            if isinstance(envelope_dict, dict)
-            else {}
+        # Поля читаются напрямую из protobuf без MessageToDict для всего
+        # конверта. Нулевые значения соответствуют неустановленным полям
+        # и, как в MessageToDict, превращаются в None
+        packet = envelope.packet
+        decoded = packet.decoded
+        portnum_value = decoded.portnum
+        portnum = (
+            _PORTNUM_NAMES.get(portnum_value, portnum_value)
+            if portnum_value
+            else None
         )
-        decoded = packet.get("decoded", {}) if isinstance(packet, dict) else {}
+        rx_time = packet.rx_time or None
+        rx_snr = packet.rx_snr
 
         raw_payload: Dict[str, Any] = {
             "type": None,
-            "portnum": decoded.get("portnum"),
-            "id": packet.get("id"),
-            "from": packet.get("from"),
-            "sender": packet.get("relay_node"),  # relay_node в protobuf
-            "to": packet.get("to"),
-            "hop_start": packet.get("hop_start"),
-            "hop_limit": packet.get("hop_limit"),
-            "timestamp": packet.get("rx_time") or packet.get("timestamp"),
-            "rx_time": packet.get("rx_time"),
-            "rssi": packet.get("rx_rssi"),
-            "snr": packet.get("rx_snr"),
+            "portnum": portnum,
+            "id": packet.id or None,
+            "from": getattr(packet, "from") or None,
+            # relay_node есть не во всех поддерживаемых версиях meshtastic
+            "sender": getattr(packet, "relay_node", 0) or None,
+            "to": packet.to or None,
+            "hop_start": packet.hop_start or None,
+            "hop_limit": packet.hop_limit or None,
+            "timestamp": rx_time,
+            "rx_time": rx_time,
+            "rssi": packet.rx_rssi or None,
+            "snr": _shortest_float32(rx_snr) if rx_snr else None,
             "payload": {},
         }
 
-        portnum = decoded.get("portnum")
         if portnum:
-            portnum_lower = str(portnum).lower()
-            if "text_message_compressed" in portnum_lower:
-                raw_payload["type"] = "text"
-            elif "text_message" in portnum_lower:
-                raw_payload["type"] = "text"
-            elif "nodeinfo" in portnum_lower:
-                raw_payload["type"] = "nodeinfo"
-            elif "position" in portnum_lower:
-                raw_payload["type"] = "position"
-            elif "telemetry" in portnum_lower:
-                raw_payload["type"] = "telemetry"
-
-        payload_b64 = decoded.get("payload")
-        if payload_b64:
+            raw_payload["type"] = _portnum_to_type(portnum)
+
+        decoded_bytes = decoded.payload
+        if decoded_bytes:
+            payload_b64 = base64.b64encode(decoded_bytes).decode("ascii")
             try:
-                decoded_bytes = base64.b64decode(payload_b64)
                 raw_payload["payload"] = {
                     "raw_base64": payload_b64,
                 }
@@ -237,7 +470,7 @@ class ProtobufMessageParser(IMessageParser):
                         raw_payload["payload"] = MessageToDict(
                             user_msg, preserving_proto_field_name=True
                         )
-                    except Exception as e:
+                    except DecodeError as e:
                         raw_payload["payload"] = {
                             "raw_base64": payload_b64,
                             "decode_error": str(e),
@@ -250,7 +483,7 @@ class ProtobufMessageParser(IMessageParser):
                         raw_payload["payload"] = MessageToDict(
                             pos, preserving_proto_field_name=True
                         )
-                    except Exception as e:
+                    except DecodeError as e:
                         raw_payload["payload"] = {
                             "raw_base64": payload_b64,
                             "decode_error": str(e),
@@ -263,14 +496,14 @@ class ProtobufMessageParser(IMessageParser):
                         raw_payload["payload"] = MessageToDict(
                             tm, preserving_proto_field_name=True
                         )
-                    except Exception as e:
+                    except DecodeError as e:
                         raw_payload["payload"] = {
                             "raw_base64": payload_b64,
                             "decode_error": str(e),
                         }
 
             except Exception as e:
-                logger.warning(f"Ошибка декодирования payload: {e}")
+                logger.warning("Ошибка декодирования payload: %s", e)
                 raw_payload["payload"] = {"raw_base64": payload_b64}
 
         return raw_payload
@@ -279,58 +512,28 @@ class ProtobufMessageParser(IMessageParser):
         self,
         raw_payload: Dict[str, Any],
         topic: str,
-        raw_payload_bytes: bytes,
     ) -> MeshtasticMessage:
         """Создает MeshtasticMessage из распарсенных данных."""
-        message_type = raw_payload.get("type")
-        message_id = raw_payload.get("id")
-        from_node = raw_payload.get("from")
-        sender_node = raw_payload.get("sender")
-        to_node = raw_payload.get("to")
         hop_start = raw_payload.get("hop_start")
         hop_limit = raw_payload.get("hop_limit")
-        hops_away = raw_payload.get("hops_away")
-        timestamp = raw_payload.get("timestamp") or raw_payload.get("rx_time")
-        rssi = raw_payload.get("rssi")
-        snr = raw_payload.get("snr")
-
-        from_node_str = _normalize_node_id(from_node)
-        sender_node_str = _normalize_node_id(sender_node)
-        to_node_str = _normalize_node_id(to_node)
-
-        # Вычисляем hops_away для protobuf, если не указан
-        hops_away_int = None
-        if hops_away is not None:
-            try:
-                hops_away_int = int(hops_away)
-            except (ValueError, TypeError):
-                hops_away_int = None
-        
-        # Для protobuf: hops_away = hop_start - hop_limit
-        if hops_away_int is None and hop_start is not None and hop_limit is not None:
+
+        # Для protobuf: hops_away = hop_start - hop_limit, если не указан
+        hops_away = _to_int(raw_payload.get("hops_away"))
+        if hops_away is None and hop_start is not None and hop_limit is not None:
             try:
-                hs = int(hop_start)
-                hl = int(hop_limit)
-                diff = hs - hl
-                hops_away_int = diff if diff >= 0 else None
+                diff = int(hop_start) - int(hop_limit)
+                hops_away = diff if diff >= 0 else None
             except (ValueError, TypeError):
                 pass
 
-        return MeshtasticMessage(
-            topic=topic,
-            raw_payload=raw_payload,
-            raw_payload_bytes=raw_payload_bytes,
-            message_id=str(message_id) if message_id else None,
-            from_node=from_node_str,
-            sender_node=sender_node_str,
-            to_node=to_node_str,
-            message_type=message_type,
-            timestamp=timestamp,
-            rssi=int(rssi) if rssi is not None else None,
-            snr=float(snr) if snr is not None else None,
-            hops_start=int(hop_start) if hop_start is not None else None,
-            hops_limit=int(hop_limit) if hop_limit is not None else None,
-            hops_away=hops_away_int,
+        return _build_message(
+            raw_payload,
+            topic,
+            MessageType.resolve(raw_payload.get("type")),
+            raw_payload["payload"],
+            timestamp=raw_payload.get("timestamp") or raw_payload.get("rx_time"),
+            hops_away=hops_away,
+            include_raw_payload=self.include_raw_payload,
         )
 
 
@@ -340,58 +543,81 @@ class MessageParserFactory:
     @staticmethod
     def create_parser(
         payload_format: str,
+        include_raw_payload: bool = False,
     ) -> IMessageParser:
         """
-        Создает парсер в зависимости от формата.
+        Возвращает парсер в зависимости от формата.
+
+        Парсеры не изменяют свое состояние при разборе, поэтому
+        для каждого сочетания параметров используется один экземпляр.
 
         Args:
             payload_format: Формат сообщений (json, protobuf, both)
+            include_raw_payload: Сохранять весь распарсенный payload
+                в сообщениях
 
         Returns:
             Парсер сообщений
         """
-        format_lower = payload_format.lower()
-
-        if format_lower == "json":
-            return JsonMessageParser()
-        elif format_lower == "protobuf":
-            return ProtobufMessageParser()
-        elif format_lower == "both":
-            # Для "both" возвращаем парсер, который пробует оба формата
-            return DualFormatParser()
-        else:
+        # Для "both" возвращается парсер, который пробует оба формата
+        parser = _PARSERS.get(
+            (payload_format.lower(), bool(include_raw_payload))
+        )
+        if parser is None:
             raise ValueError(f"Неподдерживаемый формат: {payload_format}")
+        return parser
 
 
 class DualFormatParser(IMessageParser):
     """Парсер, который пробует оба формата (JSON и Protobuf)."""
 
-    def __init__(self):
-        """Инициализирует парсеры."""
-        self.json_parser = JsonMessageParser()
-        self.protobuf_parser = ProtobufMessageParser()
+    __slots__ = ("json_parser", "protobuf_parser")
 
-    def parse(self, topic: str, payload: bytes) -> MeshtasticMessage:
+    def __init__(self, include_raw_payload: bool = False):
+        """
+        Инициализирует парсеры.
+
+        Args:
+            include_raw_payload: Сохранять весь распарсенный payload
+                в сообщениях
+        """
+        self.json_parser = JsonMessageParser(include_raw_payload)
+        self.protobuf_parser = ProtobufMessageParser(include_raw_payload)
+
+    def parse(self, topic: str, payload: PayloadBuffer) -> MeshtasticMessage:
         """
         Парсит сообщение, пробуя оба формата.
 
         Args:
             topic: MQTT топик
-            payload: Данные в байтах
+            payload: Данные в виде bytes-like объекта
 
         Returns:
             MeshtasticMessage
         """
-        # Сначала пробуем JSON (быстрее)
-        try:
-            return self.json_parser.parse(topic, payload)
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            pass
+        # JSON пробуем только для данных, похожих на JSON, чтобы
+        # protobuf сообщения не платили за исключение декодера JSON
+        if _looks_like_json(payload):
+            try:
+                return self.json_parser.parse(topic, payload)
+            except _JSON_DECODE_ERRORS:
+                pass
 
         # Если JSON не подошел, пробуем Protobuf
         try:
             return self.protobuf_parser.parse(topic, payload)
         except Exception as e:
-            logger.error(f"Ошибка парсинга сообщения: {e}")
+            logger.error("Ошибка парсинга сообщения: %s", e)
             raise
 
+
+# Экземпляры парсеров для MessageParserFactory по (формат, include_raw_payload)
+_PARSERS: Dict[Tuple[str, bool], IMessageParser] = {
+    key: parser
+    for include_raw in (False, True)
+    for key, parser in (
+        (("json", include_raw), JsonMessageParser(include_raw)),
+        (("protobuf", include_raw), ProtobufMessageParser(include_raw)),
+        (("both", include_raw), DualFormatParser(include_raw)),
+    )
+}